@@ -4,20 +4,37 @@ Core agent entrypoint for the Agentic AI Pharmacy Assistant System.
 This module implements:
 - LLM-based agent using OpenAI function calling
 - Tool definitions for backend interaction (via `tools.py`)
-- Agent execution loop that can perform multiple tool calls
+- Async agent execution loop that runs each turn's tool calls concurrently
 - Minimal CLI interface for manual testing
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
-from typing import Any, Dict, List
-
-from openai import OpenAI
-
-from config import MODEL_NAME, OPENAI_API_KEY
+import time
+import types
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Tuple
+
+import httpx
+import orjson
+from openai import AsyncOpenAI
+
+import semantic_cache
+from batcher import MicroBatcher
+from config import (
+    LLM_BATCH_MAX_SIZE,
+    LLM_BATCH_WINDOW_MS,
+    MODEL_NAME,
+    OPENAI_API_KEY,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_ENABLED,
+)
 from observability import (
-    create_span,
     create_trace,
     end_trace,
     flush_traces,
@@ -32,21 +49,28 @@ from tools import (
 )
 
 
-def get_client() -> OpenAI:
+@functools.lru_cache(maxsize=1)
+def _get_client_for_loop(loop: asyncio.AbstractEventLoop) -> AsyncOpenAI:
+    # The underlying connection pool is bound to the loop that created it.
+    return AsyncOpenAI()
+
+
+def get_client() -> AsyncOpenAI:
     if not OPENAI_API_KEY:
         raise RuntimeError(
             "OPENAI_API_KEY is not set. Please configure it in the .env file "
             "before running the agent.",
         )
-    return OpenAI()
+    return _get_client_for_loop(asyncio.get_running_loop())
 
 
-SYSTEM_PROMPT_TEMPLATE = (
+# The static instructions come first and are byte-identical for every customer
+# so that OpenAI's automatic prompt caching can reuse the prefix across runs.
+STATIC_SYSTEM_PROMPT = (
     "You are an expert licensed pharmacist assistant for an AI-powered pharmacy. "
     "You must ALWAYS use the available tools to check medicine availability, "
     "stock, and prescription requirements before making any final decision. "
     "Never hallucinate medicine availability or stock levels.\n\n"
-    "Current customer id: {customer_id}.\n\n"
     "Your responsibilities:\n"
     "1. Understand messy natural language requests about medicines and orders.\n"
     "2. Extract the medicine name and quantity from the user's input.\n"
@@ -59,27 +83,53 @@ SYSTEM_PROMPT_TEMPLATE = (
     "7. If the user asks whether they need any refills or is running out of medicine, "
     "   use get_refill_alerts with the current customer id to check for predicted refills.\n"
     "8. Never approve or reject an order without consulting tools.\n\n"
-    "When you are ready to answer the user, respond with a single JSON object only, "
-    "without any extra text. The JSON must contain at least these keys:\n"
-    "- message: human readable explanation for the user\n"
-    "- status: one of 'approved', 'pending', 'rejected', 'refill_suggested', 'ok', or 'error'\n"
-    "- order_id: include this key with the numeric id when an order is created, "
-    "  otherwise you may omit it or set it to null.\n\n"
-    "Examples of valid responses (do not quote or wrap them in text):\n"
-    "{ \"message\": \"Your order for 5 Paracetamol has been approved.\", "
-    "\"order_id\": 12, \"status\": \"approved\" }\n"
-    "{ \"message\": \"Paracetamol is currently out of stock.\", \"status\": \"rejected\" }\n"
-    "{ \"message\": \"This medicine requires a prescription. Your order is pending verification.\", "
-    "\"order_id\": 12, \"status\": \"pending\" }\n"
-    "{ \"message\": \"You are due for a refill of Paracetamol. Would you like to place an order?\", "
-    "\"status\": \"refill_suggested\", \"refill_items\": [\"Paracetamol\"] }\n"
-    "{ \"message\": \"You are not due for any refills at this time.\", \"status\": \"ok\" }\n\n"
     "If the backend is unavailable or a tool fails, clearly explain this in the "
     "message field and set status to 'rejected' or 'error' as appropriate."
 )
 
 
-TOOLS_SPEC: List[Dict[str, Any]] = [
+CUSTOMER_CONTEXT_TEMPLATE = "Current customer id: {customer_id}."
+
+
+# Structured output schema for the final answer. Strict mode requires every
+# property to be listed as required, so optional fields are nullable instead.
+RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "pharmacy_response",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Human readable explanation for the user.",
+                },
+                "status": {
+                    "type": "string",
+                    "enum": ["approved", "pending", "rejected", "refill_suggested", "ok", "error"],
+                },
+                "order_id": {
+                    "type": ["integer", "null"],
+                    "description": "Numeric id of the created order, or null if no order was created.",
+                },
+                "refill_items": {
+                    "type": ["array", "null"],
+                    "items": {"type": "string"},
+                    "description": "Medicine names due for a refill, or null.",
+                },
+            },
+            "required": ["message", "status", "order_id", "refill_items"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+# Tool definitions are part of the cached prompt prefix and are passed to the
+# SDK as-is on every call (it does not accept pre-serialized JSON); the tuple
+# keeps the definition order fixed.
+TOOLS_SPEC: Tuple[Dict[str, Any], ...] = (
     {
         "type": "function",
         "function": {
@@ -157,68 +207,377 @@ TOOLS_SPEC: List[Dict[str, Any]] = [
             },
         },
     },
-]
+)
 
 
-TOOL_DISPATCH = {
-    "check_medicine_availability": check_medicine_availability,
-    "create_order": create_order,
-    "get_customer_history": get_customer_history,
-    "get_refill_alerts": get_refill_alerts,
-}
+TOOL_DISPATCH: Mapping[str, Any] = types.MappingProxyType(
+    {
+        "check_medicine_availability": check_medicine_availability,
+        "create_order": create_order,
+        "get_customer_history": get_customer_history,
+        "get_refill_alerts": get_refill_alerts,
+    }
+)
+
+# Tools that change backend state and trigger downstream automation.
+_SIDE_EFFECT_TOOLS = frozenset({"create_order"})
+_SIDE_EFFECT_STATUSES = frozenset({"approved", "pending"})
+
+
+def _canonical_json(value: Any) -> str:
+    # Stable key order and separators keep repeated tool results byte-identical.
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode()
 
 
-def _call_llm(messages: List[Dict[str, Any]], trace: Any | None = None) -> Dict[str, Any]:
+# Maximum number of past orders re-embedded into the prompt per history call.
+_HISTORY_PROMPT_LIMIT = 10
+
+
+def _compact_tool_result(func_name: str, tool_result: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Call the LLM and, if tracing is enabled, record the generation in Langfuse.
+    Prune a tool result before it is added to the conversation.
+
+    Tool messages are re-sent as input tokens on every later step, so long
+    histories are capped and low-signal fields dropped. The full result is
+    still what gets memoized and logged.
+    """
+    if func_name == "get_customer_history" and tool_result.get("history"):
+        history = tool_result["history"]
+        compact: Dict[str, Any] = dict(tool_result)
+        # The backend returns orders newest first.
+        compact["history"] = [
+            {
+                "order_id": order.get("order_id"),
+                "status": order.get("status"),
+                "date": str(order.get("created_at") or "")[:10] or None,
+                "items": order.get("items", []),
+            }
+            for order in history[:_HISTORY_PROMPT_LIMIT]
+        ]
+        if len(history) > _HISTORY_PROMPT_LIMIT:
+            compact["truncated"] = True
+            compact["total"] = len(history)
+        return compact
+
+    if func_name == "get_refill_alerts" and tool_result.get("alerts"):
+        compact = dict(tool_result)
+        compact["alerts"] = [
+            {
+                "medicine_name": alert.get("medicine_name"),
+                "days_overdue": alert.get("days_overdue"),
+            }
+            for alert in tool_result["alerts"]
+        ]
+        return compact
+
+    return tool_result
+
+
+# Exact-match cache of final responses: key -> (customer_id, expires_at, result, trace_url).
+_RESPONSE_CACHE: OrderedDict[str, tuple[int, float, Dict[str, Any], str | None]] = OrderedDict()
+
+# Only responses that do not reflect a side effect are safe to replay.
+_CACHEABLE_STATUSES = frozenset({"ok", "refill_suggested", "rejected"})
+
+
+def _response_cache_key(customer_id: int, user_input: str) -> str:
+    raw = f"{MODEL_NAME}|{customer_id}|{user_input.strip().lower()}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _get_cached_response(key: str) -> tuple[Dict[str, Any], str | None] | None:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+
+    _, expires_at, result, trace_url = entry
+    if expires_at < time.monotonic():
+        del _RESPONSE_CACHE[key]
+        return None
+
+    _RESPONSE_CACHE.move_to_end(key)
+    return dict(result), trace_url
+
+
+def _store_cached_response(
+    key: str,
+    customer_id: int,
+    result: Dict[str, Any],
+    trace_url: str | None,
+) -> None:
+    if result.get("status") not in _CACHEABLE_STATUSES or result.get("order_id") is not None:
+        return
+
+    _RESPONSE_CACHE[key] = (
+        customer_id,
+        time.monotonic() + RESPONSE_CACHE_TTL_SECONDS,
+        dict(result),
+        trace_url,
+    )
+    _RESPONSE_CACHE.move_to_end(key)
+    while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX_ENTRIES:
+        _RESPONSE_CACHE.popitem(last=False)
+
+
+def invalidate_customer(customer_id: int) -> None:
+    """
+    Drop all cached responses for a customer, e.g. after their orders change.
     """
+    stale_keys = [key for key, entry in _RESPONSE_CACHE.items() if entry[0] == customer_id]
+    for key in stale_keys:
+        del _RESPONSE_CACHE[key]
+    semantic_cache.invalidate(customer_id)
+
+
+class _JsonObjectTracker:
+    """
+    Incrementally track brace depth to detect when the first top-level JSON
+    object in a streamed answer is complete.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.gave_up = False
+        self.consumed = 0
+
+    def feed(self, text: str) -> int | None:
+        """
+        Consume `text` and return the offset (into everything fed so far) just
+        past the closing brace once the object is complete, else None.
+        """
+        if self.gave_up:
+            return None
+
+        for idx, char in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif char == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.consumed + idx + 1
+            elif not self.started and not char.isspace():
+                # Free-form text answer; nothing to terminate early on.
+                self.gave_up = True
+                return None
+
+        self.consumed += len(text)
+        return None
+
+
+async def _consume_stream(stream: Any) -> Dict[str, Any]:
+    """
+    Rebuild a chat completion payload from a streamed response.
+
+    Tool-call deltas are accumulated by index until the stream finishes. For
+    plain-text answers, the stream is closed as soon as the final JSON object
+    is complete so the model stops generating further tokens.
+    """
+    content_parts: List[str] = []
+    tool_calls: Dict[int, Dict[str, Any]] = {}
+    finish_reason: str | None = None
+    tracker = _JsonObjectTracker()
+
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        delta = choice.delta
+        finish_reason = choice.finish_reason or finish_reason
+
+        for tc_delta in delta.tool_calls or []:
+            entry = tool_calls.setdefault(
+                tc_delta.index,
+                {"id": None, "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tc_delta.id:
+                entry["id"] = tc_delta.id
+            if tc_delta.function is not None:
+                if tc_delta.function.name:
+                    entry["function"]["name"] += tc_delta.function.name
+                if tc_delta.function.arguments:
+                    entry["function"]["arguments"] += tc_delta.function.arguments
+
+        if delta.content:
+            content_parts.append(delta.content)
+            if not tool_calls:
+                end = tracker.feed(delta.content)
+                if end is not None:
+                    content_parts = ["".join(content_parts)[:end]]
+                    finish_reason = finish_reason or "stop"
+                    await stream.close()
+                    break
+
+    message: Dict[str, Any] = {
+        "role": "assistant",
+        "content": "".join(content_parts) or None,
+        "tool_calls": [tool_calls[idx] for idx in sorted(tool_calls)] or None,
+    }
+    return {
+        "model": MODEL_NAME,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+    }
+
+
+async def _create_completion(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
     client = get_client()
+    stream = await client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages,
+        tools=TOOLS_SPEC,
+        tool_choice="auto",
+        response_format=RESPONSE_FORMAT,
+        stream=True,
+    )
+    return await _consume_stream(stream)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_batcher_for_loop(loop: asyncio.AbstractEventLoop) -> MicroBatcher:
+    return MicroBatcher(
+        _create_completion,
+        max_batch_size=LLM_BATCH_MAX_SIZE,
+        window_seconds=LLM_BATCH_WINDOW_MS / 1000,
+    )
+
+
+async def _call_llm(messages: List[Dict[str, Any]], trace: Any | None = None) -> Dict[str, Any]:
+    """
+    Call the LLM and, if tracing is enabled, record the generation in Langfuse.
 
-    if trace is None:
-        completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=messages,
-            tools=TOOLS_SPEC,
-            tool_choice="auto",
-        )
-        return completion.model_dump()
-
-    # When tracing is enabled, wrap the LLM call in a Langfuse generation span.
-    with create_span(trace, "llm-generation", as_type="generation", model=MODEL_NAME) as generation:
-        completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=messages,
-            tools=TOOLS_SPEC,
-            tool_choice="auto",
-        )
-        completion_dict = completion.model_dump()
-        log_generation(generation, messages, completion_dict, MODEL_NAME)
-        return completion_dict
+    Calls from concurrent agent runs are coalesced by the micro-batcher.
+    """
+    batcher = _get_batcher_for_loop(asyncio.get_running_loop())
+    started_at = time.time()
+    completion_dict = await batcher.submit(messages)
+    ended_at = time.time()
+    if trace is not None:
+        # Recorded as a child generation of the trace by the background logger.
+        log_generation(trace, messages, completion_dict, MODEL_NAME, started_at, ended_at)
+    return completion_dict
+
+
+# Read-only tools whose results can be reused for identical arguments within a run.
+_MEMOIZABLE_TOOLS = frozenset({"check_medicine_availability", "get_customer_history", "get_refill_alerts"})
+
+
+def _parse_tool_call(tool_call: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
+    tc_function = tool_call["function"]
+    try:
+        args = orjson.loads(tc_function.get("arguments") or "{}")
+    except orjson.JSONDecodeError:
+        args = {}
+    if not isinstance(args, dict):
+        args = {}
+    return tc_function["name"], args
+
+
+async def _execute_tool_call(
+    tool_call: Dict[str, Any],
+    tool_cache: Dict[tuple[str, str], Dict[str, Any]],
+) -> tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    Execute a single tool call requested by the model.
 
+    Successful results of read-only tools are memoized in `tool_cache` so that
+    repeated calls with the same arguments in one run skip the backend.
 
-def run_agent(user_input: str, customer_id: int, max_steps: int = 5) -> tuple[Dict[str, Any], str | None]:
+    Returns a tuple of (func_name, parsed_args, tool_result). Argument and
+    transport errors become error results; any other exception propagates and
+    is turned into an error result by the caller.
+    """
+    func_name, args = _parse_tool_call(tool_call)
+
+    tool_fn = TOOL_DISPATCH.get(func_name)
+    if not tool_fn:
+        return func_name, args, {"error": f"Unknown tool: {func_name}"}
+
+    cache_key: tuple[str, str] | None = None
+    if func_name in _MEMOIZABLE_TOOLS:
+        cache_key = (func_name, _canonical_json(args))
+        cached = tool_cache.get(cache_key)
+        if cached is not None:
+            return func_name, args, cached
+
+    try:
+        tool_result: Dict[str, Any] = await tool_fn(**args)
+    except TypeError:
+        # Argument mismatch or bad schema.
+        tool_result = {
+            "error": f"Invalid arguments for tool {func_name}",
+        }
+    except (httpx.HTTPError, ValueError) as exc:
+        # Tools normally return these as error dicts.
+        tool_result = {
+            "error": f"Tool {func_name} raised an exception: {exc}",
+        }
+
+    # Errors are not memoized so the model can retry transient failures.
+    if cache_key is not None and not tool_result.get("error"):
+        tool_cache[cache_key] = tool_result
+    return func_name, args, tool_result
+
+
+async def run_agent_async(
+    user_input: str,
+    customer_id: int,
+    max_steps: int = 5,
+) -> tuple[Dict[str, Any], str | None]:
     """
     Run the agent for a single user input and customer id.
 
     The agent may perform multiple tool calls before returning a final JSON-like
     response dictionary suitable for presenting to the user.
 
+    Identical questions from the same customer are answered from an in-memory
+    cache for a short time, skipping the LLM and all tool calls. Near-duplicate
+    questions are answered from the semantic cache when it is enabled.
+
     Returns a tuple of (result_dict, trace_url_or_none).
     """
-    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(customer_id=customer_id)
+    cache_key = _response_cache_key(customer_id, user_input)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
+
+    query_embedding = None
+    if SEMANTIC_CACHE_ENABLED and OPENAI_API_KEY:
+        query_embedding = await semantic_cache.embed(get_client(), user_input)
+        if query_embedding is not None:
+            similar = semantic_cache.lookup(customer_id, query_embedding)
+            if similar is not None:
+                return similar, None
 
     messages: List[Dict[str, Any]] = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": STATIC_SYSTEM_PROMPT},
+        {"role": "system", "content": CUSTOMER_CONTEXT_TEMPLATE.format(customer_id=customer_id)},
         {"role": "user", "content": user_input},
     ]
 
     result: Dict[str, Any]
     trace_url: str | None = None
+    tool_cache: Dict[tuple[str, str], Dict[str, Any]] = {}
+    # Runs that attempted an order must not be replayed from a cache.
+    side_effect_ran = False
 
     with create_trace(customer_id, user_input) as trace:
         try:
             for _ in range(max_steps):
-                response = _call_llm(messages, trace=trace)
+                response = await _call_llm(messages, trace=trace)
                 choice = response["choices"][0]["message"]
 
                 tool_calls = choice.get("tool_calls") or []
@@ -232,57 +591,45 @@ def run_agent(user_input: str, customer_id: int, max_steps: int = 5) -> tuple[Di
                         }
                     )
 
-                    # Execute each tool call and append its result.
-                    for tool_call in tool_calls:
-                        func_name = tool_call["function"]["name"]
-                        raw_args = tool_call["function"].get("arguments") or "{}"
-                        try:
-                            args = json.loads(raw_args)
-                        except json.JSONDecodeError:
-                            args = {}
-
-                        tool_fn = TOOL_DISPATCH.get(func_name)
-                        if not tool_fn:
-                            tool_result: Dict[str, Any] = {
-                                "error": f"Unknown tool: {func_name}",
-                            }
+                    # Execute all tool calls concurrently, then append results in order.
+                    # One failing tool must not discard the results of the others
+                    # (e.g. an order that was already placed alongside it).
+                    executed = await asyncio.gather(
+                        *(_execute_tool_call(tool_call, tool_cache) for tool_call in tool_calls),
+                        return_exceptions=True,
+                    )
+                    for tool_call, outcome in zip(tool_calls, executed):
+                        if isinstance(outcome, Exception):
+                            func_name, args = _parse_tool_call(tool_call)
+                            tool_result = {"error": f"Tool {func_name} raised an exception: {outcome}"}
+                        elif isinstance(outcome, BaseException):
+                            raise outcome
                         else:
-                            try:
-                                tool_result = tool_fn(**args)
-                            except TypeError:
-                                # Argument mismatch or bad schema.
-                                tool_result = {
-                                    "error": f"Invalid arguments for tool {func_name}",
-                                }
-                            except Exception as exc:  # noqa: BLE001
-                                tool_result = {
-                                    "error": f"Tool {func_name} raised an exception: {exc}",
+                            func_name, args, tool_result = outcome
+                        extra_metadata: Dict[str, Any] | None = None
+
+                        # When an order is created it triggers downstream warehouse automation
+                        # in the backend; record that on the create_order span itself.
+                        if func_name in _SIDE_EFFECT_TOOLS:
+                            side_effect_ran = True
+                            order_status = tool_result.get("status")
+                            order_id = tool_result.get("order_id") if order_status else None
+                            if order_id is not None and order_status in _SIDE_EFFECT_STATUSES:
+                                # Stock and order history changed; cached answers are stale.
+                                invalidate_customer(customer_id)
+                                extra_metadata = {
+                                    "warehouse_webhook": {"order_id": order_id, "status": order_status},
                                 }
 
                         # Log each tool call in Langfuse.
-                        log_tool_call(trace, func_name, args, tool_result)
-
-                        # Additionally log a synthetic warehouse_webhook span when an order is created
-                        # and would trigger downstream automation in the backend.
-                        if (
-                            func_name == "create_order"
-                            and isinstance(tool_result, dict)
-                            and tool_result.get("order_id") is not None
-                            and tool_result.get("status") in {"approved", "pending"}
-                        ):
-                            log_tool_call(
-                                trace,
-                                "warehouse_webhook",
-                                {"order_id": tool_result.get("order_id")},
-                                {"status": tool_result.get("status")},
-                            )
+                        log_tool_call(trace, func_name, args, tool_result, extra_metadata=extra_metadata)
 
                         messages.append(
                             {
                                 "role": "tool",
                                 "tool_call_id": tool_call.get("id"),
                                 "name": func_name,
-                                "content": json.dumps(tool_result),
+                                "content": _canonical_json(_compact_tool_result(func_name, tool_result)),
                             }
                         )
 
@@ -294,15 +641,20 @@ def run_agent(user_input: str, customer_id: int, max_steps: int = 5) -> tuple[Di
                 try:
                     parsed = json.loads(content)
                     if isinstance(parsed, dict):
-                        result = parsed
+                        # The schema forces optional keys to null; drop them as before.
+                        result = {key: value for key, value in parsed.items() if value is not None}
                     else:
                         result = {"message": content, "status": "unknown"}
                 except json.JSONDecodeError:
-                    # Fallback: wrap free-form text into a structured response.
+                    # Fallback for refusals or truncated output: wrap free-form text.
                     result = {"message": content, "status": "unknown"}
 
                 meta = end_trace(trace, result)
                 trace_url = meta.get("trace_url")
+                if not side_effect_ran:
+                    _store_cached_response(cache_key, customer_id, result, trace_url)
+                    if query_embedding is not None:
+                        semantic_cache.store(customer_id, query_embedding, result)
                 return result, trace_url
 
             # Safety fallback if the loop ends without a final answer.
@@ -324,6 +676,14 @@ def run_agent(user_input: str, customer_id: int, max_steps: int = 5) -> tuple[Di
             return result, trace_url
 
 
+def run_agent(user_input: str, customer_id: int, max_steps: int = 5) -> tuple[Dict[str, Any], str | None]:
+    """
+    Synchronous wrapper around `run_agent_async` for the CLI and other
+    callers that are not already running inside an event loop.
+    """
+    return asyncio.run(run_agent_async(user_input, customer_id, max_steps=max_steps))
+
+
 def _cli_loop() -> None:
     print("Agentic AI Pharmacy Assistant CLI")
     print("Backend must be running at http://localhost:8000")
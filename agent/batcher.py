@@ -0,0 +1,86 @@
+"""
+Micro-batching of LLM calls for the Agentic AI Pharmacy Assistant System.
+
+When the agent is served from the FastAPI backend, several users can hit it
+at once. Requests that arrive within a short window are coalesced and sent
+together as parallel (HTTP/2 multiplexed) requests on the shared client.
+OpenAI does not accept batched chat bodies, so a "batch" here is a group of
+concurrent calls dispatched in one `asyncio.gather`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Set, Tuple
+
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+class MicroBatcher:
+    """
+    Run submitted payloads through `handler` together. Payloads already
+    queued are taken immediately; when more than one is pending, the batch is
+    held open for up to `window_seconds` (or until `max_batch_size`).
+
+    An instance is bound to the event loop it is first used on.
+    """
+
+    def __init__(self, handler: Handler, max_batch_size: int = 8, window_seconds: float = 0.0) -> None:
+        self._handler = handler
+        self._max_batch_size = max(1, max_batch_size)
+        self._window_seconds = max(0.0, window_seconds)
+        self._queue: asyncio.Queue[Tuple[Any, asyncio.Future[Any]]] = asyncio.Queue()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._in_flight: Set[asyncio.Task[None]] = set()
+
+    async def submit(self, payload: Any) -> Any:
+        """
+        Enqueue `payload` and wait for the handler's result (or exception).
+        """
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Take whatever is already waiting without blocking.
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Only hold the batch open when other calls are arriving concurrently;
+            # a lone call (e.g. the CLI) is sent immediately.
+            if len(batch) > 1 and self._window_seconds > 0:
+                deadline = loop.time() + self._window_seconds
+                while len(batch) < self._max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+            # Run the batch without blocking collection of the next one.
+            task = asyncio.create_task(self._run_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future[Any]]]) -> None:
+        results = await asyncio.gather(
+            *(self._handler(payload) for payload, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The caller was cancelled while waiting.
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
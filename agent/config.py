@@ -27,6 +27,20 @@ BACKEND_BASE_URL: str = os.getenv("BACKEND_BASE_URL", "http://localhost:8000/api
 # Default model for the agent (can be overridden via env if needed)
 MODEL_NAME: str = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
 
+# Micro-batching of concurrent LLM calls (window of 0 disables the wait)
+LLM_BATCH_MAX_SIZE: int = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_WINDOW_MS: float = float(os.getenv("LLM_BATCH_WINDOW_MS", "0"))
+
+# Exact-match response cache for repeated user questions
+RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Semantic cache for near-duplicate user questions
+SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "256"))
+EMBEDDING_MODEL_NAME: str = os.getenv("OPENAI_EMBEDDING_MODEL_NAME", "text-embedding-3-small")
+
 # Langfuse configuration
 LANGFUSE_PUBLIC_KEY: str | None = os.getenv("LANGFUSE_PUBLIC_KEY")
 LANGFUSE_SECRET_KEY: str | None = os.getenv("LANGFUSE_SECRET_KEY")
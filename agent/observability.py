@@ -7,16 +7,25 @@ This module centralizes all interaction with Langfuse so that the rest of the
 agent code only needs to call simple helper functions. If Langfuse is not
 configured or fails, all functions in this module degrade gracefully and do
 not raise errors.
+
+Tool-call and generation records are handed to a background worker thread so
+that building and exporting Langfuse observations stays off the agent's
+critical path. Call `flush_traces` to wait for pending records.
 """
 
+import logging
+import queue
+import threading
+import time
 from contextlib import nullcontext
-from datetime import datetime
-from typing import Any, ContextManager, Dict, Optional
+from typing import Any, Callable, ContextManager, Dict, Optional, Union
 
 from langfuse import get_client
 
 from config import LANGFUSE_HOST
 
+logger = logging.getLogger(__name__)
+
 
 try:
     # The client picks up credentials and base URL from environment variables.
@@ -29,6 +38,35 @@ def _is_enabled() -> bool:
     return _langfuse is not None
 
 
+# Pending observability work; a threading.Event is a flush marker.
+_QUEUE: queue.SimpleQueue[Union[Callable[[], None], threading.Event]] = queue.SimpleQueue()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def _drain_queue() -> None:
+    while True:
+        item = _QUEUE.get()
+        if isinstance(item, threading.Event):
+            item.set()
+            continue
+        try:
+            item()
+        except Exception as exc:  # noqa: BLE001
+            # Never let observability failures impact the agent, but leave a trace.
+            logger.warning("Langfuse logging job failed: %s", exc)
+
+
+def _enqueue(job: Union[Callable[[], None], threading.Event]) -> None:
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = threading.Thread(target=_drain_queue, name="langfuse-logger", daemon=True)
+                _worker.start()
+    _QUEUE.put(job)
+
+
 def create_trace(customer_id: int, user_input: str) -> ContextManager[Any]:
     """
     Create a root observation for an agent run.
@@ -41,7 +79,7 @@ def create_trace(customer_id: int, user_input: str) -> ContextManager[Any]:
 
     metadata = {
         "customer_id": customer_id,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": time.time(),
     }
     return _langfuse.start_as_current_observation(
         as_type="span",
@@ -69,43 +107,78 @@ def create_span(trace: Any, name: str, as_type: str = "span", **kwargs: Any) ->
     )
 
 
-def log_generation(observation: Any, messages: Any, response: Any, model: str) -> None:
+def log_generation(
+    trace: Any,
+    messages: Any,
+    response: Any,
+    model: str,
+    start_time: float,
+    end_time: float,
+) -> None:
     """
-    Log an LLM generation, including input messages and raw response payload.
+    Log an LLM generation, including input messages and raw response payload,
+    as a child generation of `trace`.
+
+    The observation is built on the background worker, after the call has
+    finished, so the caller's `start_time`/`end_time` (epoch seconds) are
+    recorded as the LLM latency. `messages` is copied here because the caller
+    keeps appending to it.
     """
-    if not _is_enabled() or observation is None:
+    if not _is_enabled() or trace is None:
         return
 
-    try:
-        observation.update(
-            input={"messages": messages},
+    snapshot = list(messages)
+    metadata = {
+        "type": "llm-generation",
+        "model": model,
+        "started_at": start_time,
+        "ended_at": end_time,
+        "latency_ms": round((end_time - start_time) * 1000, 1),
+    }
+
+    def _job() -> None:
+        generation = trace.start_observation(
+            as_type="generation",
+            name="llm-generation",
+            model=model,
+            input={"messages": snapshot},
             output=response,
-            metadata={"type": "llm-generation", "model": model},
+            metadata=metadata,
         )
-    except Exception:  # noqa: BLE001
-        # Never let observability failures impact the agent.
-        return
+        generation.end()
+
+    _enqueue(_job)
 
 
-def log_tool_call(trace: Any, tool_name: str, arguments: Dict[str, Any], result: Any) -> None:
+def log_tool_call(
+    trace: Any,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    result: Any,
+    extra_metadata: Optional[Dict[str, Any]] = None,
+) -> None:
     """
-    Log a backend tool call as its own span.
+    Log a backend tool call as its own child span of `trace`.
+
+    `extra_metadata` is merged into the span metadata, e.g. to record the
+    warehouse webhook triggered by a created order.
     """
-    if not _is_enabled():
+    if not _is_enabled() or trace is None:
         return
 
-    try:
-        with _langfuse.start_as_current_observation(
+    logged_at = time.time()
+
+    def _job() -> None:
+        span = trace.start_observation(
             as_type="span",
             name=f"tool:{tool_name}",
-        ) as span:
-            span.update(
-                input={"tool_name": tool_name, "arguments": arguments},
-                output=result,
-                metadata={"type": "tool-call"},
-            )
-    except Exception:  # noqa: BLE001
-        return
+            input={"tool_name": tool_name, "arguments": arguments},
+            output=result,
+            metadata={"type": "tool-call", "logged_at": logged_at, **(extra_metadata or {})},
+        )
+        span.end()
+
+    _enqueue(_job)
 
 
 def end_trace(trace: Any, output: Dict[str, Any], error: Optional[BaseException] = None) -> Dict[str, Optional[str]]:
@@ -140,10 +213,16 @@ def end_trace(trace: Any, output: Dict[str, Any], error: Optional[BaseException]
 def flush_traces() -> None:
     """
     Flush pending Langfuse events, useful in short-lived CLI processes.
+
+    Waits (bounded) for the background worker to process queued records
+    before flushing the Langfuse client itself.
     """
     if not _is_enabled():
         return
     try:
+        marker = threading.Event()
+        _enqueue(marker)
+        marker.wait(timeout=5)
         _langfuse.flush()
     except Exception:  # noqa: BLE001
         return
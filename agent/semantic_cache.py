@@ -0,0 +1,132 @@
+"""
+Semantic response cache for the Agentic AI Pharmacy Assistant System.
+
+Users phrase the same intent in many ways ("do I need a refill?", "am I
+running low?"). This module stores L2-normalized embeddings of past user
+inputs per customer and returns a prior response when a new input is close
+enough in cosine similarity.
+
+Answers reflect stock levels and order history that can change outside the
+agent, so entries live in memory only and expire after
+`RESPONSE_CACHE_TTL_SECONDS`, the same lifetime as the exact-match cache.
+
+All functions degrade gracefully: embedding failures simply result in a
+cache miss and never raise into the agent.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import (
+    EMBEDDING_MODEL_NAME,
+    RESPONSE_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+
+
+# Statuses that do not reflect a state change and are safe to replay.
+_CACHEABLE_STATUSES = frozenset({"ok", "refill_suggested"})
+
+# Per-customer (N, D) embedding matrices, with parallel results and
+# monotonic expiry timestamps.
+_EMBEDDINGS: Dict[int, np.ndarray] = {}
+_RESULTS: Dict[int, List[Dict[str, Any]]] = {}
+_EXPIRES: Dict[int, np.ndarray] = {}
+
+
+def _drop_expired(customer_id: int) -> None:
+    expires = _EXPIRES.get(customer_id)
+    if expires is None:
+        return
+
+    live = expires > time.monotonic()
+    if live.all():
+        return
+    if not live.any():
+        invalidate(customer_id)
+        return
+
+    _EMBEDDINGS[customer_id] = _EMBEDDINGS[customer_id][live]
+    _RESULTS[customer_id] = [result for result, keep in zip(_RESULTS[customer_id], live) if keep]
+    _EXPIRES[customer_id] = expires[live]
+
+
+async def embed(client: Any, text: str) -> Optional[np.ndarray]:
+    """
+    Embed a user input and return it as an L2-normalized vector.
+
+    Returns None if the embedding call fails.
+    """
+    try:
+        response = await client.embeddings.create(model=EMBEDDING_MODEL_NAME, input=text.strip())
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    except Exception:  # noqa: BLE001
+        return None
+
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return None
+    return vector / norm
+
+
+def lookup(customer_id: int, query: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached result most similar to `query`, if it clears the threshold.
+    """
+    _drop_expired(customer_id)
+    embeddings = _EMBEDDINGS.get(customer_id)
+    if embeddings is None or embeddings.shape[1] != query.shape[0]:
+        return None
+
+    scores = embeddings @ query
+    idx = int(np.argmax(scores))
+    if scores[idx] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+
+    result = _RESULTS[customer_id][idx]
+    if result.get("status") not in _CACHEABLE_STATUSES:
+        return None
+    return dict(result)
+
+
+def store(customer_id: int, query: np.ndarray, result: Dict[str, Any]) -> None:
+    """
+    Remember a result for `query`, evicting the oldest entries past the cap.
+    """
+    if result.get("status") not in _CACHEABLE_STATUSES or result.get("order_id") is not None:
+        return
+
+    _drop_expired(customer_id)
+    embeddings = _EMBEDDINGS.get(customer_id)
+    if embeddings is None or embeddings.shape[1] != query.shape[0]:
+        # First entry, or the embedding model changed dimensionality.
+        embeddings = np.empty((0, query.shape[0]), dtype=np.float32)
+        _RESULTS[customer_id] = []
+        _EXPIRES[customer_id] = np.empty(0, dtype=np.float64)
+
+    embeddings = np.vstack([embeddings, query[np.newaxis, :].astype(np.float32)])
+    results = _RESULTS[customer_id] + [dict(result)]
+    expires = np.append(_EXPIRES[customer_id], time.monotonic() + RESPONSE_CACHE_TTL_SECONDS)
+
+    if len(results) > SEMANTIC_CACHE_MAX_ENTRIES:
+        embeddings = embeddings[-SEMANTIC_CACHE_MAX_ENTRIES:]
+        results = results[-SEMANTIC_CACHE_MAX_ENTRIES:]
+        expires = expires[-SEMANTIC_CACHE_MAX_ENTRIES:]
+
+    _EMBEDDINGS[customer_id] = embeddings
+    _RESULTS[customer_id] = results
+    _EXPIRES[customer_id] = expires
+
+
+def invalidate(customer_id: int) -> None:
+    """
+    Drop all cached entries for a customer.
+    """
+    _EMBEDDINGS.pop(customer_id, None)
+    _RESULTS.pop(customer_id, None)
+    _EXPIRES.pop(customer_id, None)
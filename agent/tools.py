@@ -8,18 +8,41 @@ JSON-like dictionaries without raising exceptions.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 from typing import Any, Dict, List
 
-import requests
+import httpx
+import orjson
 
 from config import BACKEND_BASE_URL
 
 
-def _build_url(path: str) -> str:
-    return f"{BACKEND_BASE_URL.rstrip('/')}/{path.lstrip('/')}"
+# Paths relative to BACKEND_BASE_URL, precomputed once per process.
+_AVAILABILITY_PATH = "medicines/{}/availability"
+_ORDERS_PATH = "orders/"
+_HISTORY_PATH = "customers/{}/history"
+_REFILL_ALERTS_PATH = "customers/{}/refill-alerts"
 
 
-def check_medicine_availability(medicine_name: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1)
+def _get_http_client(loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+    # Pooled connections are bound to the event loop that opened them, so the
+    # client is cached per loop (the CLI runs one loop per request).
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        # Retries cover connection failures only; HTTP error statuses are returned as-is.
+        retries=2,
+    )
+    return httpx.AsyncClient(base_url=BACKEND_BASE_URL, timeout=5, transport=transport)
+
+
+def _client() -> httpx.AsyncClient:
+    return _get_http_client(asyncio.get_running_loop())
+
+
+async def check_medicine_availability(medicine_name: str) -> Dict[str, Any]:
     """
     Check availability, stock quantity, and prescription requirement for a medicine.
 
@@ -31,9 +54,8 @@ def check_medicine_availability(medicine_name: str) -> Dict[str, Any]:
         "error": Optional[str]
     }
     """
-    url = _build_url(f"medicines/{medicine_name}/availability")
     try:
-        response = requests.get(url, timeout=5)
+        response = await _client().get(_AVAILABILITY_PATH.format(medicine_name))
         if response.status_code == 404:
             return {
                 "available": False,
@@ -43,14 +65,14 @@ def check_medicine_availability(medicine_name: str) -> Dict[str, Any]:
             }
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return {
             "available": bool(data.get("available", False)),
             "stock_quantity": int(data.get("stock_quantity", 0) or 0),
             "prescription_required": bool(data.get("prescription_required", False)),
             "error": None,
         }
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         return {
             "available": False,
             "stock_quantity": 0,
@@ -66,7 +88,7 @@ def check_medicine_availability(medicine_name: str) -> Dict[str, Any]:
         }
 
 
-def create_order(customer_id: int, medicine_name: str, quantity: int) -> Dict[str, Any]:
+async def create_order(customer_id: int, medicine_name: str, quantity: int) -> Dict[str, Any]:
     """
     Create an order for a specific customer, medicine, and quantity.
 
@@ -78,23 +100,26 @@ def create_order(customer_id: int, medicine_name: str, quantity: int) -> Dict[st
         "error": Optional[str]
     }
     """
-    url = _build_url("orders")
     payload = {
         "customer_id": customer_id,
         "medicine_name": medicine_name,
         "quantity": quantity,
     }
     try:
-        response = requests.post(url, json=payload, timeout=5)
+        response = await _client().post(
+            _ORDERS_PATH,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         return {
             "status": data.get("status", "rejected"),
             "order_id": data.get("order_id"),
             "reason": data.get("reason"),
             "error": None,
         }
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         return {
             "status": "rejected",
             "order_id": None,
@@ -110,7 +135,7 @@ def create_order(customer_id: int, medicine_name: str, quantity: int) -> Dict[st
         }
 
 
-def get_customer_history(customer_id: int) -> Dict[str, Any]:
+async def get_customer_history(customer_id: int) -> Dict[str, Any]:
     """
     Retrieve the order history for a specific customer.
 
@@ -120,23 +145,22 @@ def get_customer_history(customer_id: int) -> Dict[str, Any]:
         "error": Optional[str]
     }
     """
-    url = _build_url(f"customers/{customer_id}/history")
     try:
-        response = requests.get(url, timeout=5)
+        response = await _client().get(_HISTORY_PATH.format(customer_id))
         if response.status_code == 404:
             return {"history": [], "error": "Customer not found"}
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         history: List[Dict[str, Any]] = list(data) if isinstance(data, list) else []
         return {"history": history, "error": None}
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         return {"history": [], "error": f"Request error: {exc}"}
     except ValueError:
         return {"history": [], "error": "Invalid JSON response from backend"}
 
 
-def get_refill_alerts(customer_id: int) -> Dict[str, Any]:
+async def get_refill_alerts(customer_id: int) -> Dict[str, Any]:
     """
     Retrieve predicted refill alerts for a specific customer.
 
@@ -146,18 +170,17 @@ def get_refill_alerts(customer_id: int) -> Dict[str, Any]:
         "error": Optional[str]
     }
     """
-    url = _build_url(f"customers/{customer_id}/refill-alerts")
     try:
-        response = requests.get(url, timeout=5)
+        response = await _client().get(_REFILL_ALERTS_PATH.format(customer_id))
         if response.status_code == 404:
             # Customer endpoint itself does not return 404 here, but we guard anyway.
             return {"alerts": [], "error": "Customer not found"}
 
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         alerts: List[Dict[str, Any]] = list(data) if isinstance(data, list) else []
         return {"alerts": alerts, "error": None}
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         return {"alerts": [], "error": f"Request error: {exc}"}
     except ValueError:
         return {"alerts": [], "error": "Invalid JSON response from backend"}
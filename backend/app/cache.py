@@ -0,0 +1,165 @@
+"""
+Redis read-through cache helpers for the backend.
+
+Caching is optional: if `REDIS_URL` is not configured, the `redis` package is
+not installed, or Redis is unreachable, every helper degrades to a cache miss
+or no-op and never raises into the request path.
+
+The helpers are coroutines on `redis.asyncio` with short socket timeouts, so a
+slow Redis delays only the awaiting request, never the event loop.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional
+
+from app.config import settings
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+MEDICINES_ALL_KEY = "medicines:all:v1"
+MEDICINE_KEY_PREFIX = "medicine:"
+MEDICINE_AVAILABILITY_KEY_PREFIX = "medicine:avail:"
+REFILL_KEY_PREFIX = "refill:"
+REFILL_ADMIN_KEY = "refill:admin:v1"
+
+MEDICINES_ALL_TTL_SECONDS = 300
+MEDICINE_TTL_SECONDS = 60
+MEDICINE_AVAILABILITY_TTL_SECONDS = 5
+REFILL_ALERTS_TTL_SECONDS = 60
+
+
+def _build_client() -> Optional["aioredis.Redis"]:
+    if aioredis is None or not settings.REDIS_URL:
+        return None
+    try:
+        return aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to configure Redis cache at %s: %s", settings.REDIS_URL, exc)
+        return None
+
+
+_client = _build_client()
+
+
+async def close() -> None:
+    """
+    Release pooled Redis connections on shutdown.
+    """
+    if _client is None:
+        return
+    try:
+        await _client.aclose()
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to close Redis cache client: %s", exc)
+
+
+def medicine_key(name: str) -> str:
+    return f"{MEDICINE_KEY_PREFIX}{name.strip().lower()}"
+
+
+def medicine_availability_key(name: str) -> str:
+    return f"{MEDICINE_AVAILABILITY_KEY_PREFIX}{name.strip().lower()}"
+
+
+def refill_customer_key(customer_id: int) -> str:
+    return f"{REFILL_KEY_PREFIX}cust:{customer_id}:v1"
+
+
+async def get_json(key: str) -> Any:
+    """
+    Return the decoded JSON value stored at `key`, or None on a miss or error.
+    """
+    if _client is None:
+        return None
+    try:
+        raw = await _client.get(key)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis GET failed for %s: %s", key, exc)
+        return None
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+async def set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """
+    Store `value` as JSON at `key` with an expiry.
+    """
+    if _client is None:
+        return
+    try:
+        await _client.set(key, json.dumps(value), ex=ttl_seconds)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis SET failed for %s: %s", key, exc)
+
+
+async def delete(*keys: str) -> None:
+    """
+    Delete the given keys, ignoring missing ones.
+    """
+    if _client is None or not keys:
+        return
+    try:
+        await _client.delete(*keys)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis DELETE failed for %s: %s", keys, exc)
+
+
+async def delete_prefix(prefix: str) -> None:
+    """
+    Delete every key starting with `prefix` (uses SCAN, not KEYS).
+    """
+    if _client is None:
+        return
+    try:
+        stale = [key async for key in _client.scan_iter(match=f"{prefix}*", count=500)]
+        if stale:
+            await _client.delete(*stale)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Redis prefix delete failed for %s: %s", prefix, exc)
+
+
+async def invalidate_medicine(name: str) -> None:
+    """
+    Drop the catalog list and the cached entries for a single medicine.
+    """
+    await delete(MEDICINES_ALL_KEY, medicine_key(name), medicine_availability_key(name))
+
+
+async def invalidate_all_medicines() -> None:
+    """
+    Drop every cached medicine entry, e.g. after a catalog import.
+    """
+    await delete(MEDICINES_ALL_KEY)
+    await delete_prefix(MEDICINE_KEY_PREFIX)
+
+
+async def invalidate_refill_alerts(customer_id: int) -> None:
+    """
+    Drop cached refill alerts for a customer and the admin aggregate.
+    """
+    await delete(refill_customer_key(customer_id), REFILL_ADMIN_KEY)
+
+
+async def invalidate_all_refill_alerts() -> None:
+    """
+    Drop every cached refill alert entry, e.g. after an order history import.
+    """
+    await delete_prefix(REFILL_KEY_PREFIX)
@@ -24,6 +24,14 @@ class Settings:
     LANGFUSE_SECRET_KEY: str | None = os.getenv("LANGFUSE_SECRET_KEY")
     DATABASE_URL: str = os.getenv("DATABASE_URL", _DEFAULT_DB_URL)
     WAREHOUSE_WEBHOOK_URL: str | None = os.getenv("WAREHOUSE_WEBHOOK_URL")
+    REDIS_URL: str | None = os.getenv("REDIS_URL")
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Set when an external pooler (e.g. PgBouncer) already multiplexes connections.
+    DB_USE_NULLPOOL: bool = os.getenv("DB_USE_NULLPOOL", "false").lower() in {"1", "true", "yes"}
 
 
 settings = Settings()
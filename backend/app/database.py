@@ -1,26 +1,104 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from .config import settings
 
 
 DATABASE_URL = settings.DATABASE_URL
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+# Async driver for each sync URL scheme; request handlers use the async engine.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
 
+
+def _to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = _to_async_url(DATABASE_URL)
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+
+def _uses_queue_pool(url: str) -> bool:
+    # In-memory SQLite gets a singleton/static pool that rejects size arguments.
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return True
+    database = parsed.database or ""
+    return database not in ("", ":memory:") and parsed.query.get("mode") != "memory"
+
+
+def _pool_args(url: str) -> dict:
+    if settings.DB_USE_NULLPOOL:
+        return {"poolclass": NullPool}
+
+    args = {
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+    if _uses_queue_pool(url):
+        args.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return args
+
+
+# Pool arguments are resolved per URL so each engine gets ones its pool class accepts.
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **_pool_args(DATABASE_URL))
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, connect_args=connect_args, **_pool_args(ASYNC_DATABASE_URL)
+)
+
+
+if IS_SQLITE:
+
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _connection_record) -> None:
+        # WAL lets readers proceed while a write is in progress.
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# Sync sessions are used for startup work (table creation, Excel import).
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def _existing_index_names(conn, table_name: str) -> set[str]:
+    if IS_SQLITE:
+        # SQLite reflection skips expression indexes such as lower(name).
+        rows = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+            (table_name,),
+        )
+        return {name for (name,) in rows}
+    return {index["name"] for index in inspect(conn).get_indexes(table_name)}
 
 
 def init_db() -> None:
@@ -28,10 +106,19 @@ def init_db() -> None:
     Initialize database tables.
 
     Imports all model modules so that SQLAlchemy is aware of them,
-    then creates tables based on the metadata.
+    then creates tables based on the metadata. Indexes added to models after
+    a table already exists are created as well.
     """
     # Local imports to avoid circular dependencies at import time.
     from app.models import medicine, customer, order, order_item  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
 
+    # create_all skips existing tables entirely, including their new indexes.
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = _existing_index_names(conn, table.name)
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn)
+
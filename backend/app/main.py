@@ -1,11 +1,14 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.database import init_db
+from app import cache
+from app.database import async_engine, init_db
 from app.routes import customer_router, medicine_router, order_router, refill_router
-from app.routes.agent_routes import router as agent_router
+from app.routes.agent_routes import flush_traces, router as agent_router
 from app.utils.load_excel_data import load_initial_data
+from app.utils.webhook import close_webhook_client, start_webhook_client
 
 
 @asynccontextmanager
@@ -13,7 +16,16 @@ async def lifespan(app: FastAPI):
     """Run startup tasks when the app starts."""
     init_db()
     load_initial_data()
+    # The import may have changed the catalog and any customer's order history.
+    await cache.invalidate_all_medicines()
+    await cache.invalidate_all_refill_alerts()
+    start_webhook_client()
     yield
+    # Agent observations are exported from a background queue; send what is left.
+    await asyncio.to_thread(flush_traces)
+    await close_webhook_client()
+    await async_engine.dispose()
+    await cache.close()
 
 
 app = FastAPI(title="Agentic Pharmacy Backend", lifespan=lifespan)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -11,8 +11,11 @@ class Customer(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, nullable=True, unique=True)
+    email = Column(String, nullable=True, unique=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Case-insensitive email matching.
+    __table_args__ = (Index("ix_customers_email_lower", func.lower(email)),)
+
     orders = relationship("Order", back_populates="customer")
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -17,5 +17,8 @@ class Medicine(Base):
     prescription_required = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Case-insensitive name lookups (func.lower(name) == ...) in routes and tools.
+    __table_args__ = (Index("ix_medicines_name_lower", func.lower(name)),)
+
     order_items = relationship("OrderItem", back_populates="medicine")
 
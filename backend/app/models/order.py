@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -14,6 +14,9 @@ class Order(Base):
     status = Column(String, nullable=False, default="pending")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Serves per-customer history/refill lookups sorted by recency.
+    __table_args__ = (Index("ix_orders_customer_created", customer_id, created_at.desc()),)
+
     customer = relationship("Customer", back_populates="orders")
     items = relationship("OrderItem", back_populates="order")
 
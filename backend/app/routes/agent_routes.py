@@ -1,24 +1,20 @@
 from __future__ import annotations
 
 import sys
-from pathlib import Path
 from typing import Any, Dict
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-# Add the agent directory to sys.path so we can import agent.py correctly
-agent_path = Path(__file__).parent.parent.parent.parent / "agent"
-if str(agent_path) not in sys.path:
-    sys.path.append(str(agent_path))
+from app.config import BASE_DIR
 
-try:
-    from agent import run_agent
-except ImportError:
-    # Fallback if the path logic is tricky in different environments
-    # In a real production setup, this would be a proper package
-    sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-    from agent.agent import run_agent
+# The agent modules import their siblings by plain name (`from config import ...`),
+# so the agent directory itself must be importable. Resolve it once per process.
+AGENT_DIR = str(BASE_DIR / "agent")
+if "agent" not in sys.modules and AGENT_DIR not in sys.path:
+    sys.path.append(AGENT_DIR)
+
+from agent import flush_traces, run_agent_async  # noqa: E402,F401
 
 router = APIRouter(tags=["agent"])
 
@@ -36,7 +32,7 @@ async def chat_with_agent(request: ChatRequest):
     Handle chat requests by calling the agent logic.
     """
     try:
-        response, trace_url = run_agent(request.message, request.customer_id)
+        response, trace_url = await run_agent_async(request.message, request.customer_id)
         return ChatResponse(response=response, trace_url=trace_url)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
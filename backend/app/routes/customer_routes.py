@@ -1,11 +1,14 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.database import get_db
 from app.models.customer import Customer
 from app.models.order import Order
+from app.models.order_item import OrderItem
 from app.schemas.customer_schema import (
     CustomerOrderHistoryItem,
     CustomerOut,
@@ -16,14 +19,20 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 
 
 @router.get("/", response_model=List[CustomerOut])
-def list_customers(db: Session = Depends(get_db)):
-    customers = db.query(Customer).order_by(Customer.created_at.desc()).all()
+async def list_customers(db: AsyncSession = Depends(get_db)):
+    customers = (
+        await db.scalars(
+            select(Customer)
+            .options(raiseload("*"))
+            .order_by(Customer.created_at.desc())
+        )
+    ).all()
     return customers
 
 
 @router.get("/{customer_id}/history", response_model=List[CustomerOrderHistoryItem])
-def get_customer_history(customer_id: int, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == customer_id).first()
+async def get_customer_history(customer_id: int, db: AsyncSession = Depends(get_db)):
+    customer = await db.get(Customer, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -31,11 +40,17 @@ def get_customer_history(customer_id: int, db: Session = Depends(get_db)):
         )
 
     orders = (
-        db.query(Order)
-        .filter(Order.customer_id == customer_id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
+        await db.scalars(
+            select(Order)
+            # Any relationship not loaded here raises instead of issuing a lazy SELECT per row.
+            .options(
+                selectinload(Order.items).selectinload(OrderItem.medicine),
+                raiseload("*"),
+            )
+            .where(Order.customer_id == customer_id)
+            .order_by(Order.created_at.desc())
+        )
+    ).all()
 
     history: List[CustomerOrderHistoryItem] = []
     for order in orders:
@@ -1,9 +1,10 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import cache
 from app.database import get_db
 from app.models.medicine import Medicine
 from app.schemas.medicine_schema import MedicineAvailability, MedicineOut
@@ -12,33 +13,51 @@ router = APIRouter(prefix="/medicines", tags=["medicines"])
 
 
 @router.get("/", response_model=List[MedicineOut])
-def list_medicines(db: Session = Depends(get_db)):
-    medicines = db.query(Medicine).order_by(Medicine.name.asc()).all()
-    return medicines
+async def list_medicines(db: AsyncSession = Depends(get_db)):
+    cached = await cache.get_json(cache.MEDICINES_ALL_KEY)
+    if cached is not None:
+        return cached
+
+    medicines = (await db.scalars(select(Medicine).order_by(Medicine.name.asc()))).all()
+    payload = [MedicineOut.model_validate(medicine).model_dump(mode="json") for medicine in medicines]
+    await cache.set_json(cache.MEDICINES_ALL_KEY, payload, cache.MEDICINES_ALL_TTL_SECONDS)
+    return payload
 
 
 @router.get("/{medicine_name}", response_model=MedicineOut)
-def get_medicine(medicine_name: str, db: Session = Depends(get_db)):
+async def get_medicine(medicine_name: str, db: AsyncSession = Depends(get_db)):
+    key = cache.medicine_key(medicine_name)
+    cached = await cache.get_json(key)
+    if cached is not None:
+        return cached
+
     medicine = (
-        db.query(Medicine)
-        .filter(func.lower(Medicine.name) == medicine_name.strip().lower())
-        .first()
-    )
+        await db.scalars(
+            select(Medicine).where(func.lower(Medicine.name) == medicine_name.strip().lower()).limit(1)
+        )
+    ).first()
     if not medicine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Medicine not found",
         )
-    return medicine
+    payload = MedicineOut.model_validate(medicine).model_dump(mode="json")
+    await cache.set_json(key, payload, cache.MEDICINE_TTL_SECONDS)
+    return payload
 
 
 @router.get("/{medicine_name}/availability", response_model=MedicineAvailability)
-def check_medicine_availability(medicine_name: str, db: Session = Depends(get_db)):
+async def check_medicine_availability(medicine_name: str, db: AsyncSession = Depends(get_db)):
+    key = cache.medicine_availability_key(medicine_name)
+    cached = await cache.get_json(key)
+    if cached is not None:
+        return cached
+
     medicine = (
-        db.query(Medicine)
-        .filter(func.lower(Medicine.name) == medicine_name.strip().lower())
-        .first()
-    )
+        await db.scalars(
+            select(Medicine).where(func.lower(Medicine.name) == medicine_name.strip().lower()).limit(1)
+        )
+    ).first()
     if not medicine:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,9 +65,11 @@ def check_medicine_availability(medicine_name: str, db: Session = Depends(get_db
         )
 
     available = medicine.stock_quantity > 0
-    return MedicineAvailability(
+    availability = MedicineAvailability(
         available=available,
         stock_quantity=medicine.stock_quantity,
         prescription_required=medicine.prescription_required,
     )
+    await cache.set_json(key, availability.model_dump(mode="json"), cache.MEDICINE_AVAILABILITY_TTL_SECONDS)
+    return availability
 
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from typing import Any, Dict
 
+from fastapi import APIRouter, BackgroundTasks, Depends
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import cache
 from app.database import get_db
 from app.models.customer import Customer
 from app.models.medicine import Medicine
@@ -13,40 +16,32 @@ from app.utils.webhook import send_mock_confirmation_email, send_mock_webhook
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
-def trigger_warehouse_webhook(order: Order, medicine: Medicine, quantity: int, customer: Customer) -> None:
+async def trigger_warehouse_webhook(order_id: int, payload: Dict[str, Any]) -> None:
     """
     Trigger downstream automation (warehouse webhook and confirmation email).
 
-    This helper must never raise exceptions; any failures are logged only.
+    Runs as a background task after the response is sent. This helper must
+    never raise exceptions; any failures are logged only.
     """
-    payload = {
-        "customer_id": customer.id,
-        "customer_email": customer.email,
-        "medicine_name": medicine.name,
-        "quantity": quantity,
-        "order_status": order.status,
-        "order_id": order.id,
-    }
-
     try:
-        send_mock_webhook(order.id, payload)
-        send_mock_confirmation_email(customer.email, payload)
+        await send_mock_webhook(order_id, payload)
+        send_mock_confirmation_email(payload.get("customer_email"), payload)
     except Exception:
         # Swallow all exceptions to avoid impacting order creation.
         return
 
 
 @router.post("/", response_model=OrderResponse)
-def create_order(payload: OrderCreate, db: Session = Depends(get_db)):
-    customer = db.query(Customer).filter(Customer.id == payload.customer_id).first()
+async def create_order(payload: OrderCreate, background: BackgroundTasks, db: AsyncSession = Depends(get_db)):
+    customer = await db.get(Customer, payload.customer_id)
     if not customer:
         return OrderResponse(status="rejected", reason="Customer not found")
 
     medicine = (
-        db.query(Medicine)
-        .filter(func.lower(Medicine.name) == payload.medicine_name.strip().lower())
-        .first()
-    )
+        await db.scalars(
+            select(Medicine).where(func.lower(Medicine.name) == payload.medicine_name.strip().lower()).limit(1)
+        )
+    ).first()
     if not medicine:
         return OrderResponse(status="rejected", reason="Medicine not found")
 
@@ -60,27 +55,46 @@ def create_order(payload: OrderCreate, db: Session = Depends(get_db)):
     if medicine.prescription_required:
         status_value = "pending"
 
-    order = Order(
-        customer_id=customer.id,
-        status=status_value,
+    # Decrement stock atomically so concurrent orders cannot oversell.
+    result = await db.execute(
+        update(Medicine)
+        .where(Medicine.id == medicine.id, Medicine.stock_quantity >= payload.quantity)
+        .values(stock_quantity=Medicine.stock_quantity - payload.quantity)
     )
-    db.add(order)
-    db.flush()
+    if result.rowcount == 0:
+        await db.rollback()
+        return OrderResponse(status="rejected", reason="Insufficient stock")
 
-    order_item = OrderItem(
-        order_id=order.id,
-        medicine_id=medicine.id,
-        quantity=payload.quantity,
+    order_id = (
+        await db.execute(insert(Order).values(customer_id=customer.id, status=status_value).returning(Order.id))
+    ).scalar_one()
+    await db.execute(
+        insert(OrderItem).values(
+            order_id=order_id,
+            medicine_id=medicine.id,
+            quantity=payload.quantity,
+        )
     )
-    db.add(order_item)
 
-    medicine.stock_quantity -= payload.quantity
+    # Snapshot the webhook payload while the ORM objects are still loaded.
+    webhook_payload = {
+        "customer_id": customer.id,
+        "customer_email": customer.email,
+        "medicine_name": medicine.name,
+        "quantity": payload.quantity,
+        "order_status": status_value,
+        "order_id": order_id,
+    }
+
+    await db.commit()
 
-    db.commit()
-    db.refresh(order)
+    # Stock changed; drop cached catalog and availability entries for this medicine.
+    await cache.invalidate_medicine(webhook_payload["medicine_name"])
+    # A new purchase changes this customer's refill schedule.
+    await cache.invalidate_refill_alerts(webhook_payload["customer_id"])
 
-    # Fire-and-forget warehouse webhook and confirmation email.
-    trigger_warehouse_webhook(order, medicine, payload.quantity, customer)
+    # Warehouse webhook and confirmation email run after the response is sent.
+    background.add_task(trigger_warehouse_webhook, order_id, webhook_payload)
 
-    return OrderResponse(status=status_value, order_id=order.id)
+    return OrderResponse(status=status_value, order_id=order_id)
 
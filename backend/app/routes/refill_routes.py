@@ -3,36 +3,43 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import cache
 from app.database import get_db
-from app.models.customer import Customer
-from app.services.refill_service import get_refill_alerts_for_customer
+from app.services.refill_service import (
+    get_refill_alerts_for_all_customers,
+    get_refill_alerts_for_customer,
+)
 
 router = APIRouter(tags=["refill"])
 
 
 @router.get("/customers/{customer_id}/refill-alerts")
-def get_customer_refill_alerts(customer_id: int) -> List[Dict[str, Any]]:
+async def get_customer_refill_alerts(customer_id: int, db: AsyncSession = Depends(get_db)) -> List[Dict[str, Any]]:
     """
     Return refill alerts for a single customer.
     """
-    return get_refill_alerts_for_customer(customer_id)
+    key = cache.refill_customer_key(customer_id)
+    cached = await cache.get_json(key)
+    if cached is not None:
+        return cached
+
+    alerts = await get_refill_alerts_for_customer(customer_id, session=db)
+    await cache.set_json(key, alerts, cache.REFILL_ALERTS_TTL_SECONDS)
+    return alerts
 
 
 @router.get("/admin/refill-alerts")
-def get_all_refill_alerts(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+async def get_all_refill_alerts(db: AsyncSession = Depends(get_db)) -> List[Dict[str, Any]]:
     """
     Return refill alerts across all customers.
     """
-    customers = db.query(Customer.id).all()
-    results: List[Dict[str, Any]] = []
-    for (customer_id,) in customers:
-        alerts = get_refill_alerts_for_customer(customer_id)
-        for alert in alerts:
-            enriched = dict(alert)
-            enriched["customer_id"] = customer_id
-            results.append(enriched)
-
-    return results
+    cached = await cache.get_json(cache.REFILL_ADMIN_KEY)
+    if cached is not None:
+        return cached
+
+    alerts = await get_refill_alerts_for_all_customers(db)
+    await cache.set_json(cache.REFILL_ADMIN_KEY, alerts, cache.REFILL_ALERTS_TTL_SECONDS)
+    return alerts
 
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .order_schema import OrderItemSummary
 
@@ -12,8 +12,7 @@ class CustomerOut(BaseModel):
     email: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CustomerOrderHistoryItem(BaseModel):
@@ -22,6 +21,5 @@ class CustomerOrderHistoryItem(BaseModel):
     created_at: datetime
     items: List[OrderItemSummary]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
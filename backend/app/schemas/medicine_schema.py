@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class MedicineBase(BaseModel):
@@ -11,8 +11,7 @@ class MedicineBase(BaseModel):
     stock_quantity: int
     prescription_required: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicineOut(MedicineBase):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class OrderCreate(BaseModel):
@@ -27,6 +27,5 @@ class OrderSummary(BaseModel):
     created_at: datetime
     items: list[OrderItemSummary]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
@@ -3,38 +3,34 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-from sqlalchemy import asc
-from sqlalchemy.orm import Session
+from sqlalchemy import asc, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.medicine import Medicine
 from app.models.order import Order
 from app.models.order_item import OrderItem
 
 
-def _compute_alerts_for_medicine(
-    dates: List[datetime],
+def _alert_from_summary(
     medicine_name: str,
+    first_purchase: datetime,
+    last_purchase: datetime,
+    purchase_days: int,
 ) -> Dict[str, Any] | None:
     """
-    Given a sorted list of purchase datetimes for a single medicine, compute
-    whether a refill is due and, if so, return an alert dictionary.
-    """
-    if not dates:
-        return None
+    Compute whether a refill is due from a per-medicine purchase summary and,
+    if so, return an alert dictionary.
 
-    dates = sorted(dates)
-    last_purchase = dates[-1]
-
-    if len(dates) == 1:
-        avg_interval_days = 30.0
+    `purchase_days` is the number of distinct calendar days with a purchase.
+    The average of the positive day gaps between consecutive purchases is
+    the first-to-last span divided by `purchase_days - 1`; with fewer than
+    two distinct days a fixed 30-day interval is used.
+    """
+    if purchase_days > 1:
+        avg_interval_days = (last_purchase.date() - first_purchase.date()).days / (purchase_days - 1)
     else:
-        deltas = []
-        for i in range(1, len(dates)):
-            delta_days = (dates[i].date() - dates[i - 1].date()).days
-            if delta_days > 0:
-                deltas.append(delta_days)
-        avg_interval_days = sum(deltas) / len(deltas) if deltas else 30.0
+        avg_interval_days = 30.0
 
     today = datetime.utcnow().date()
     estimated_due_date = last_purchase.date() + timedelta(days=avg_interval_days)
@@ -52,7 +48,34 @@ def _compute_alerts_for_medicine(
     }
 
 
-def get_refill_alerts_for_customer(customer_id: int) -> List[Dict[str, Any]]:
+def _purchase_summary_query():
+    """
+    One row per (customer, medicine): first and last purchase and the number
+    of distinct purchase days. Individual purchases never leave the database.
+    """
+    return (
+        select(
+            Order.customer_id,
+            Medicine.name,
+            func.min(Order.created_at),
+            func.max(Order.created_at),
+            func.count(distinct(func.date(Order.created_at))),
+        )
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .join(Medicine, Medicine.id == OrderItem.medicine_id)
+        .group_by(Order.customer_id, Medicine.id, Medicine.name)
+    )
+
+
+def _sort_alerts(alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    alerts.sort(key=lambda a: a["days_overdue"], reverse=True)
+    return alerts
+
+
+async def get_refill_alerts_for_customer(
+    customer_id: int,
+    session: AsyncSession | None = None,
+) -> List[Dict[str, Any]]:
     """
     Compute refill alerts for a single customer based on historical orders.
 
@@ -63,51 +86,68 @@ def get_refill_alerts_for_customer(customer_id: int) -> List[Dict[str, Any]]:
       - If last_purchase_date + avg_interval < today => refill is due.
       - If there is only one purchase, use a fixed interval of 30 days.
 
+    When `session` is given it is used as-is and left open for the caller;
+    otherwise a short-lived session is opened and closed here.
+
     Returns a list of alert dictionaries and never raises an exception.
     """
-    session: Session | None = None
+    owns_session = session is None
     try:
-        session = SessionLocal()
-        rows = (
-            session.query(
-                Medicine.id,
-                Medicine.name,
-                Order.created_at,
-            )
-            .join(OrderItem, OrderItem.medicine_id == Medicine.id)
-            .join(Order, OrderItem.order_id == Order.id)
-            .filter(Order.customer_id == customer_id)
-            .order_by(asc(Medicine.id), asc(Order.created_at))
-            .all()
+        if session is None:
+            session = AsyncSessionLocal()
+        stream = await session.stream(
+            _purchase_summary_query()
+            .where(Order.customer_id == customer_id)
+            .execution_options(yield_per=1000)
         )
 
-        if not rows:
-            return []
-
-        purchases: Dict[int, Dict[str, Any]] = {}
-        for med_id, med_name, created_at in rows:
-            record = purchases.setdefault(
-                med_id,
-                {"name": med_name, "dates": []},
-            )
-            if isinstance(created_at, datetime):
-                record["dates"].append(created_at)
-
         alerts: List[Dict[str, Any]] = []
-        for med_id, info in purchases.items():
-            alert = _compute_alerts_for_medicine(
-                dates=info["dates"],
-                medicine_name=info["name"],
-            )
+        async for _, med_name, first_purchase, last_purchase, purchase_days in stream:
+            alert = _alert_from_summary(med_name, first_purchase, last_purchase, purchase_days)
             if alert:
                 alerts.append(alert)
 
-        alerts.sort(key=lambda a: a["days_overdue"], reverse=True)
-        return alerts
+        return _sort_alerts(alerts)
     except Exception:
         # Fail-safe: never propagate errors to the API layer.
         return []
     finally:
-        if session is not None:
-            session.close()
+        if owns_session and session is not None:
+            await session.close()
+
+
+async def get_refill_alerts_for_all_customers(session: AsyncSession) -> List[Dict[str, Any]]:
+    """
+    Compute refill alerts for every customer with a single grouped query.
+
+    Uses the same rules as `get_refill_alerts_for_customer`. Each alert also
+    carries its `customer_id`; alerts are grouped by customer (ascending) and
+    ordered most overdue first within a customer. Summary rows are streamed
+    in chunks rather than materialized up front.
+
+    Returns a list of alert dictionaries and never raises an exception.
+    """
+    try:
+        stream = await session.stream(
+            _purchase_summary_query()
+            .order_by(asc(Order.customer_id))
+            .execution_options(yield_per=1000)
+        )
 
+        results: List[Dict[str, Any]] = []
+        current: List[Dict[str, Any]] = []
+        current_customer_id = None
+        async for customer_id, med_name, first_purchase, last_purchase, purchase_days in stream:
+            if customer_id != current_customer_id:
+                results.extend(_sort_alerts(current))
+                current = []
+                current_customer_id = customer_id
+            alert = _alert_from_summary(med_name, first_purchase, last_purchase, purchase_days)
+            if alert:
+                alert["customer_id"] = customer_id
+                current.append(alert)
+        results.extend(_sort_alerts(current))
+        return results
+    except Exception:
+        # Fail-safe: never propagate errors to the API layer.
+        return []
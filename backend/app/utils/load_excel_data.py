@@ -1,10 +1,11 @@
+import importlib.util
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import pandas as pd
-from sqlalchemy import func
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from app.config import BASE_DIR
@@ -24,48 +25,51 @@ DATA_DIR = BASE_DIR / "backend" / "data"
 PRODUCTS_FILE = DATA_DIR / "products-export.xlsx"
 HISTORY_FILE = DATA_DIR / "consumer-order-history.xlsx"
 
+# The Rust-based calamine reader is much faster than openpyxl; fall back to
+# pandas' default engine when python-calamine is not installed.
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
 
-def _get_value(row: Dict[str, Any], aliases: Iterable[str], default: Any = None) -> Any:
+
+_TRUE_VALUES = ["y", "yes", "true", "t", "1"]
+
+
+def _find_column(columns: Iterable[Any], aliases: Iterable[str]) -> Optional[Any]:
+    by_lower: Dict[str, Any] = {}
+    for column in columns:
+        by_lower.setdefault(str(column).lower(), column)
     for alias in aliases:
-        for key in row.keys():
-            if key.lower() == alias.lower():
-                return row.get(key, default)
-    return default
+        if alias.lower() in by_lower:
+            return by_lower[alias.lower()]
+    return None
 
 
-def _to_int(value: Any, default: int = 0) -> int:
-    try:
-        if value is None or (isinstance(value, float) and pd.isna(value)):
-            return default
-        return int(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _to_bool(value: Any, default: bool = False) -> bool:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return default
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
-        return bool(value)
-    text = str(value).strip().lower()
-    if text in {"y", "yes", "true", "t", "1"}:
-        return True
-    if text in {"n", "no", "false", "f", "0"}:
-        return False
-    return default
-
-
-def _to_datetime(value: Any) -> datetime:
-    if isinstance(value, datetime):
-        return value
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return datetime.utcnow()
-    try:
-        return pd.to_datetime(value).to_pydatetime()
-    except (TypeError, ValueError):
-        return datetime.utcnow()
+def _column(df: pd.DataFrame, aliases: Iterable[str]) -> pd.Series:
+    # Resolve the alias once per import instead of once per row.
+    column = _find_column(df.columns, aliases)
+    if column is None:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    return df[column]
+
+
+def _as_int(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors="coerce").fillna(0).astype("int64")
+
+
+def _as_bool(series: pd.Series) -> pd.Series:
+    text = series.astype(str).str.strip().str.lower()
+    numeric = pd.to_numeric(series, errors="coerce").fillna(0)
+    return text.isin(_TRUE_VALUES) | (numeric != 0)
+
+
+def _as_str(series: pd.Series) -> pd.Series:
+    # Blank cells and NaN become None so they never reach the database as "nan".
+    text = series.astype(str).str.strip()
+    return text.astype(object).where(series.notna() & (text != ""), None)
+
+
+def _as_datetime(series: pd.Series) -> pd.Series:
+    parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+    return parsed.astype(object).where(parsed.notna(), datetime.utcnow())
 
 
 def _load_dataframe(path: Path, label: str) -> Optional[pd.DataFrame]:
@@ -73,12 +77,27 @@ def _load_dataframe(path: Path, label: str) -> Optional[pd.DataFrame]:
         logger.info("Excel file not found for %s: %s", label, path)
         return None
     try:
-        return pd.read_excel(path)
+        return pd.read_excel(path, engine=EXCEL_ENGINE)
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to read Excel file for %s from %s: %s", label, path, exc)
         return None
 
 
+def _index_medicines(session: Session) -> Dict[str, Medicine]:
+    # One query per import; lookups by lowercase name are then O(1) in memory.
+    return {medicine.name.strip().lower(): medicine for medicine in session.query(Medicine).all()}
+
+
+def _index_customers(session: Session) -> Tuple[Dict[str, Customer], Dict[str, Customer]]:
+    by_email: Dict[str, Customer] = {}
+    by_name: Dict[str, Customer] = {}
+    for customer in session.query(Customer).order_by(Customer.id).all():
+        if customer.email:
+            by_email.setdefault(customer.email.strip().lower(), customer)
+        by_name.setdefault(customer.name.strip().lower(), customer)
+    return by_email, by_name
+
+
 def _upsert_medicines(session: Session) -> None:
     df = _load_dataframe(PRODUCTS_FILE, "products")
     if df is None or df.empty:
@@ -86,42 +105,44 @@ def _upsert_medicines(session: Session) -> None:
 
     inserted = 0
     updated = 0
+    existing_by_name = _index_medicines(session)
+
+    rows = pd.DataFrame(
+        {
+            "name": _as_str(_column(df, ["name", "medicine_name", "product_name"])),
+            "category": _as_str(_column(df, ["category", "type"])),
+            "unit": _as_str(_column(df, ["unit", "uom"])),
+            "stock": _as_int(_column(df, ["stock_quantity", "stock", "quantity"])),
+            "prescription_required": _as_bool(
+                _column(df, ["prescription_required", "requires_prescription", "rx_required"])
+            ),
+        }
+    )
 
-    for row in df.to_dict(orient="records"):
-        name = _get_value(row, ["name", "medicine_name", "product_name"])
+    for name, category, unit, stock, prescription_required in rows.itertuples(index=False, name=None):
         if not name:
             continue
 
-        category = _get_value(row, ["category", "type"])
-        unit = _get_value(row, ["unit", "uom"])
-        stock = _to_int(_get_value(row, ["stock_quantity", "stock", "quantity"], 0), 0)
-        prescription_required = _to_bool(
-            _get_value(row, ["prescription_required", "requires_prescription", "rx_required"], False),
-            False,
-        )
-
-        existing = (
-            session.query(Medicine)
-            .filter(func.lower(Medicine.name) == name.strip().lower())
-            .first()
-        )
+        existing = existing_by_name.get(name.strip().lower())
 
         if existing:
             existing.category = category or existing.category
             existing.unit = unit or existing.unit
             if stock:
-                existing.stock_quantity = stock
-            existing.prescription_required = prescription_required
+                existing.stock_quantity = int(stock)
+            existing.prescription_required = bool(prescription_required)
             updated += 1
         else:
             medicine = Medicine(
-                name=name.strip(),
+                name=name,
                 category=category,
                 unit=unit,
-                stock_quantity=stock,
-                prescription_required=prescription_required,
+                stock_quantity=int(stock),
+                prescription_required=bool(prescription_required),
             )
             session.add(medicine)
+            # Later rows with the same name update this object instead of inserting again.
+            existing_by_name[medicine.name.lower()] = medicine
             inserted += 1
 
     session.commit()
@@ -133,47 +154,9 @@ def _upsert_medicines(session: Session) -> None:
     )
 
 
-def _get_or_create_customer(session: Session, name: str, email: Optional[str]) -> Customer:
-    query = session.query(Customer)
-    if email:
-        existing = query.filter(func.lower(Customer.email) == email.strip().lower()).first()
-        if existing:
-            return existing
-
-    existing = (
-        query.filter(func.lower(Customer.name) == name.strip().lower()).first()
-        if name
-        else None
-    )
-    if existing:
-        if email and not existing.email:
-            existing.email = email.strip()
-        return existing
-
-    customer = Customer(name=name.strip() if name else "Unknown", email=email.strip() if email else None)
-    session.add(customer)
-    session.flush()
-    return customer
-
-
-def _get_or_create_medicine(session: Session, name: str) -> Optional[Medicine]:
-    if not name:
-        return None
-    existing = (
-        session.query(Medicine)
-        .filter(func.lower(Medicine.name) == name.strip().lower())
-        .first()
-    )
-    if existing:
-        return existing
-    medicine = Medicine(
-        name=name.strip(),
-        stock_quantity=0,
-        prescription_required=False,
-    )
-    session.add(medicine)
-    session.flush()
-    return medicine
+def _dedup_key(customer_id: int, medicine_id: int, quantity: int, created_at: datetime) -> tuple:
+    # Timestamps are compared at second precision, matching the old date_trunc probe.
+    return (customer_id, medicine_id, quantity, created_at.replace(microsecond=0))
 
 
 def _load_order_history(session: Session) -> None:
@@ -181,85 +164,117 @@ def _load_order_history(session: Session) -> None:
     if df is None or df.empty:
         return
 
-    created_items = 0
-
-    for row in df.to_dict(orient="records"):
-        customer_name = _get_value(row, ["customer_name", "name", "customer"])
-        customer_email = _get_value(row, ["customer_email", "email"])
-        medicine_name = _get_value(row, ["medicine_name", "product_name", "name"])
-        quantity = _to_int(_get_value(row, ["quantity", "qty", "amount"], 0), 0)
-        status = _get_value(row, ["status", "order_status"], "completed") or "completed"
-        created_at_raw = _get_value(row, ["created_at", "order_date", "date"])
-        created_at = _to_datetime(created_at_raw)
-
-        if not medicine_name or quantity <= 0:
-            continue
+    rows = pd.DataFrame(
+        {
+            "customer_name": _as_str(_column(df, ["customer_name", "name", "customer"])),
+            "customer_email": _as_str(_column(df, ["customer_email", "email"])),
+            "medicine_name": _as_str(_column(df, ["medicine_name", "product_name", "name"])),
+            "quantity": _as_int(_column(df, ["quantity", "qty", "amount"])),
+            "status": _as_str(_column(df, ["status", "order_status"])),
+            "created_at": _as_datetime(_column(df, ["created_at", "order_date", "date"])),
+        }
+    )
+    rows = rows[rows["medicine_name"].notna() & (rows["quantity"] > 0)]
 
-        customer = _get_or_create_customer(
-            session,
+    parsed_rows = [
+        (
             customer_name or "Unknown",
             customer_email,
+            medicine_name,
+            int(quantity),
+            status or "completed",
+            pd.Timestamp(created_at).to_pydatetime(),
         )
-        medicine = _get_or_create_medicine(session, medicine_name)
+        for customer_name, customer_email, medicine_name, quantity, status, created_at in rows.itertuples(
+            index=False, name=None
+        )
+    ]
+
+    if not parsed_rows:
+        return
+
+    # Resolve customers and medicines from in-memory indexes built with one SELECT each.
+    customers_by_email, customers_by_name = _index_customers(session)
+    medicines_by_name = _index_medicines(session)
+
+    resolved = []
+    for customer_name, customer_email, medicine_name, quantity, status, created_at in parsed_rows:
+        customer = customers_by_email.get(customer_email.lower()) if customer_email else None
+        if customer is None:
+            customer = customers_by_name.get(customer_name.lower())
+            if customer is not None and customer_email and not customer.email:
+                customer.email = customer_email
+                customers_by_email[customer_email.lower()] = customer
+        if customer is None:
+            customer = Customer(name=customer_name, email=customer_email)
+            session.add(customer)
+            customers_by_name[customer_name.lower()] = customer
+            if customer_email:
+                customers_by_email[customer_email.lower()] = customer
+
+        medicine = medicines_by_name.get(medicine_name.lower())
         if medicine is None:
-            continue
+            medicine = Medicine(name=medicine_name, stock_quantity=0, prescription_required=False)
+            session.add(medicine)
+            medicines_by_name[medicine_name.lower()] = medicine
 
-        existing_item = None
-        try:
-            existing_item = (
-                session.query(OrderItem)
-                .join(Order)
-                .filter(
-                    Order.customer_id == customer.id,
-                    OrderItem.medicine_id == medicine.id,
-                    OrderItem.quantity == quantity,
-                    func.date_trunc("second", Order.created_at)
-                    == func.date_trunc("second", created_at),
-                )
-                .first()
-            )
-        except Exception:  # noqa: BLE001
-            # date_trunc is PostgreSQL-only; fall through to the SQLite fallback.
-            session.rollback()
-        # SQLite-compatible fallback when date_trunc is unavailable.
-        if existing_item is None:
-            existing_item = (
-                session.query(OrderItem)
-                .join(Order)
-                .filter(
-                    Order.customer_id == customer.id,
-                    OrderItem.medicine_id == medicine.id,
-                    OrderItem.quantity == quantity,
-                    Order.created_at == created_at,
+        resolved.append((customer, medicine, quantity, status, created_at))
+
+    # Only customers that existed before this import can already have orders.
+    known_customer_ids = {customer.id for customer, *_ in resolved if customer.id is not None}
+
+    # A single flush assigns ids to all new customers and medicines in batches.
+    session.flush()
+
+    existing_keys = set()
+    if known_customer_ids:
+        existing_keys = {
+            _dedup_key(customer_id, medicine_id, quantity, created_at)
+            for customer_id, medicine_id, quantity, created_at in session.execute(
+                select(
+                    Order.customer_id,
+                    OrderItem.medicine_id,
+                    OrderItem.quantity,
+                    Order.created_at,
                 )
-                .first()
+                .join_from(Order, OrderItem)
+                .where(Order.customer_id.in_(known_customer_ids))
             )
+        }
 
-        if existing_item:
+    pending = []
+    for customer, medicine, quantity, status, created_at in resolved:
+        key = _dedup_key(customer.id, medicine.id, quantity, created_at)
+        if key in existing_keys:
             continue
-
-        order = Order(
-            customer_id=customer.id,
-            status=status,
-            created_at=created_at,
-        )
-        session.add(order)
-        session.flush()
-
-        order_item = OrderItem(
-            order_id=order.id,
-            medicine_id=medicine.id,
-            quantity=quantity,
-            created_at=created_at,
+        existing_keys.add(key)
+        pending.append((customer.id, medicine.id, quantity, status, created_at))
+
+    if pending:
+        order_ids = session.scalars(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            [
+                {"customer_id": customer_id, "status": status, "created_at": created_at}
+                for customer_id, _, _, status, created_at in pending
+            ],
+        ).all()
+        session.execute(
+            insert(OrderItem),
+            [
+                {
+                    "order_id": order_id,
+                    "medicine_id": medicine_id,
+                    "quantity": quantity,
+                    "created_at": created_at,
+                }
+                for order_id, (_, medicine_id, quantity, _, created_at) in zip(order_ids, pending)
+            ],
         )
-        session.add(order_item)
-
-        created_items += 1
 
     session.commit()
     logger.info(
         "Order history import complete. Created %s order items from %s",
-        created_items,
+        len(pending),
         HISTORY_FILE,
     )
 
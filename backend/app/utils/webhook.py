@@ -1,16 +1,41 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import requests
+import httpx
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-def send_mock_webhook(order_id: int, payload: Dict[str, Any]) -> None:
+# Shared client so webhook calls reuse pooled connections instead of a new
+# TCP/TLS handshake per order. Managed by the application lifespan.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def start_webhook_client() -> None:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=5,
+            # Retries cover connection failures only; a delivered POST is never resent.
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                retries=2,
+            ),
+        )
+
+
+async def close_webhook_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def send_mock_webhook(order_id: int, payload: Dict[str, Any]) -> None:
     """
     Send a mock webhook to the configured warehouse endpoint.
 
@@ -26,14 +51,15 @@ def send_mock_webhook(order_id: int, payload: Dict[str, Any]) -> None:
         "payload": payload,
     }
 
+    start_webhook_client()
     try:
-        response = requests.post(url, json=body, timeout=5)
+        response = await _client.post(url, json=body)
         logger.info(
             "Warehouse webhook sent for order %s, status_code=%s",
             order_id,
             response.status_code,
         )
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         logger.warning(
             "Warehouse webhook failed for order %s: %s",
             order_id,